@@ -7,41 +7,87 @@ import json
 import os
 import sys
 
+# Use orjson if available, it is considerably faster than the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Use ijson if available, to parse large files incrementally instead of reading them whole
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Files larger than this are parsed with ijson
+STREAM_THRESHOLD = 2 ** 20
+
+def load_json(f):
+    """Load a JSON array from a file opened in binary mode."""
+    if IJSON_AVAILABLE and os.fstat(f.fileno()).st_size > STREAM_THRESHOLD:
+        return list(ijson.items(f, "item", use_float=True))
+    if ORJSON_AVAILABLE:
+        return orjson.loads(f.read())
+    return json.loads(f.read())
+
+def write_json(obj, path):
+    """Write indented JSON to a file, passing the encoded bytes straight to the file descriptor."""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode("utf-8")
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        remaining = memoryview(data)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
+
 def combine_results(style_file, grammar_file, output_file):
-    """Combine style and grammar check results."""
+    """Combine style and grammar check results.
+
+    Returns the number of combined suggestions, and whether the style and
+    grammar files were found.
+    """
     # Load style suggestions
     style_suggestions = []
-    if os.path.exists(style_file):
-        try:
-            with open(style_file, "r") as f:
-                style_suggestions = json.load(f)
-                # Ensure each suggestion has a reason that includes "Style"
-                for sugg in style_suggestions:
-                    if "reason" in sugg and "Style" not in sugg["reason"]:
-                        sugg["reason"] = f"Style: {sugg['reason']}"
-        except json.JSONDecodeError:
-            print(f"Error: {style_file} is not valid JSON")
-        except Exception as e:
-            print(f"Error loading {style_file}: {e}")
-    else:
+    style_found = False
+    try:
+        with open(style_file, "rb") as f:
+            style_found = True
+            style_suggestions = load_json(f)
+            # Ensure each suggestion has a reason that includes "Style"
+            for sugg in style_suggestions:
+                if "reason" in sugg and "Style" not in sugg["reason"]:
+                    sugg["reason"] = f"Style: {sugg['reason']}"
+    except FileNotFoundError:
         print(f"Warning: Style file {style_file} does not exist")
+    except json.JSONDecodeError:
+        print(f"Error: {style_file} is not valid JSON")
+    except Exception as e:
+        print(f"Error loading {style_file}: {e}")
 
     # Load grammar suggestions
     grammar_suggestions = []
-    if os.path.exists(grammar_file):
-        try:
-            with open(grammar_file, "r") as f:
-                grammar_suggestions = json.load(f)
-                # Ensure each suggestion has a reason that includes "Grammar"
-                for sugg in grammar_suggestions:
-                    if "reason" in sugg and "Grammar" not in sugg["reason"]:
-                        sugg["reason"] = f"Grammar: {sugg['reason']}"
-        except json.JSONDecodeError:
-            print(f"Error: {grammar_file} is not valid JSON")
-        except Exception as e:
-            print(f"Error loading {grammar_file}: {e}")
-    else:
+    grammar_found = False
+    try:
+        with open(grammar_file, "rb") as f:
+            grammar_found = True
+            grammar_suggestions = load_json(f)
+            # Ensure each suggestion has a reason that includes "Grammar"
+            for sugg in grammar_suggestions:
+                if "reason" in sugg and "Grammar" not in sugg["reason"]:
+                    sugg["reason"] = f"Grammar: {sugg['reason']}"
+    except FileNotFoundError:
         print(f"Warning: Grammar file {grammar_file} does not exist")
+    except json.JSONDecodeError:
+        print(f"Error: {grammar_file} is not valid JSON")
+    except Exception as e:
+        print(f"Error loading {grammar_file}: {e}")
 
     # Combine suggestions
     combined_suggestions = style_suggestions + grammar_suggestions
@@ -56,14 +102,13 @@ def combine_results(style_file, grammar_file, output_file):
 
     # Save combined suggestions
     try:
-        with open(output_file, "w") as f:
-            json.dump(combined_suggestions, f, indent=2)
+        write_json(combined_suggestions, output_file)
         print(f"Successfully wrote combined suggestions to {output_file}")
     except Exception as e:
         print(f"Error writing to {output_file}: {e}")
-        return 0
+        return 0, (style_found, grammar_found)
 
-    return len(combined_suggestions)
+    return len(combined_suggestions), (style_found, grammar_found)
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
@@ -79,12 +124,8 @@ if __name__ == "__main__":
     print(f"Grammar file: {grammar_file}")
     print(f"Output file: {output_file}")
     
-    # Check if files exist
-    print(f"Style file exists: {os.path.exists(style_file)}")
-    print(f"Grammar file exists: {os.path.exists(grammar_file)}")
-    
     # Combine results
-    total_suggestions = combine_results(style_file, grammar_file, output_file)
+    total_suggestions, (style_found, grammar_found) = combine_results(style_file, grammar_file, output_file)
     
     # Exit with status code based on success
-    sys.exit(0 if total_suggestions > 0 or (not os.path.exists(style_file) and not os.path.exists(grammar_file)) else 1)
+    sys.exit(0 if total_suggestions > 0 or not (style_found or grammar_found) else 1)
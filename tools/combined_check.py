@@ -5,58 +5,47 @@ This script runs both style and grammar checks and combines the results.
 """
 
 import argparse
-import json
 import os
 import sys
-import subprocess
 from pathlib import Path
 
-def run_style_check(file_path, rules_file, output_file):
-    """Run the style checker on a file."""
-    cmd = [
-        "python3", "tools/enhanced_style_check.py",
-        "--file", file_path,
-        "--rules", rules_file,
-        "--output", output_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True)
-        return True
-    except subprocess.CalledProcessError:
-        print(f"Error running style check on {file_path}")
-        return False
+import enhanced_style_check
+import grammar_check
+from combine_results import write_json
 
-def run_grammar_check(file_path, output_file):
-    """Run the grammar checker on a file."""
-    cmd = [
-        "python3", "tools/grammar_check.py",
-        "--file", file_path,
-        "--output", output_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True)
-        return True
-    except subprocess.CalledProcessError:
-        print(f"Error running grammar check on {file_path}")
-        return False
+def iter_markdown_files(directory):
+    """Yield the paths of all markdown files under a directory."""
+    # os.scandir returns the entry type with the listing, avoiding a stat call per entry
+    stack = [directory]
+    while stack:
+        directory = stack.pop()
+        # Skip directories that cannot be listed, as os.walk does
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            print(f"Error reading directory {directory}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith((".md", ".mdx")):
+                    yield entry.path
 
-def combine_suggestions(style_file, grammar_file, output_file):
-    """Combine style and grammar suggestions into a single file."""
-    style_suggestions = []
-    grammar_suggestions = []
+def check_file(file_path, style_rules):
+    """Run the style and grammar checkers on a file and return both lists of suggestions."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
     
-    # Load style suggestions
-    if os.path.exists(style_file):
-        with open(style_file, "r") as f:
-            style_suggestions = json.load(f)
-    
-    # Load grammar suggestions
-    if os.path.exists(grammar_file):
-        with open(grammar_file, "r") as f:
-            grammar_suggestions = json.load(f)
+    style_suggestions = enhanced_style_check.check_style(content, file_path, style_rules)
+    grammar_suggestions = grammar_check.check_grammar(content, file_path)
+    print(f"Checked {file_path}: Found {len(style_suggestions)} style issues "
+          f"and {len(grammar_suggestions)} grammar issues")
     
+    return style_suggestions, grammar_suggestions
+
+def combine_suggestions(style_suggestions, grammar_suggestions, output_file):
+    """Combine style and grammar suggestions into a single file."""
     # Combine suggestions
     combined_suggestions = style_suggestions + grammar_suggestions
     
@@ -64,8 +53,7 @@ def combine_suggestions(style_file, grammar_file, output_file):
     combined_suggestions.sort(key=lambda x: (x["file"], x["line"]))
     
     # Save combined suggestions
-    with open(output_file, "w") as f:
-        json.dump(combined_suggestions, f, indent=2)
+    write_json(combined_suggestions, output_file)
     
     return len(combined_suggestions)
 
@@ -90,41 +78,27 @@ def main():
         print("Error: Please provide either --file or --dir argument")
         sys.exit(1)
     
-    style_count = 0
-    grammar_count = 0
-    combined_count = 0
+    # Load style rules
+    style_rules = enhanced_style_check.load_style_rules(args.rules)
+    if not style_rules:
+        print("Error: No style rules loaded. Check the rules file.")
+        sys.exit(1)
+    
+    all_style_suggestions = []
+    all_grammar_suggestions = []
     
     # Check a specific file
     if args.file:
-        if not os.path.isfile(args.file):
-            print(f"Error: File not found: {args.file}")
-            sys.exit(1)
-        
         if not args.file.endswith((".md", ".mdx")):
             print(f"Warning: {args.file} is not a markdown file. Checking anyway.")
         
-        # Run style check
-        style_output = f"{args.file}.style.json"
-        if run_style_check(args.file, args.rules, style_output):
-            with open(style_output, "r") as f:
-                style_suggestions = json.load(f)
-                style_count = len(style_suggestions)
-        
-        # Run grammar check
-        grammar_output = f"{args.file}.grammar.json"
-        if run_grammar_check(args.file, grammar_output):
-            with open(grammar_output, "r") as f:
-                grammar_suggestions = json.load(f)
-                grammar_count = len(grammar_suggestions)
-        
-        # Combine results
-        combined_count = combine_suggestions(style_output, grammar_output, args.output)
-        
-        # Clean up temporary files
-        if os.path.exists(style_output):
-            os.remove(style_output)
-        if os.path.exists(grammar_output):
-            os.remove(grammar_output)
+        try:
+            style_suggestions, grammar_suggestions = check_file(args.file, style_rules)
+        except (UnicodeDecodeError, OSError) as e:
+            print(f"Error checking {args.file}: {e}")
+            sys.exit(1)
+        all_style_suggestions.extend(style_suggestions)
+        all_grammar_suggestions.extend(grammar_suggestions)
     
     # Check all markdown files in a directory
     if args.dir:
@@ -132,54 +106,20 @@ def main():
             print(f"Error: Directory not found: {args.dir}")
             sys.exit(1)
         
-        all_style_suggestions = []
-        all_grammar_suggestions = []
-        
-        for root, _, files in os.walk(args.dir):
-            for file in files:
-                if file.endswith((".md", ".mdx")):
-                    file_path = os.path.join(root, file)
-                    
-                    # Run style check
-                    style_output = f"{file_path}.style.json"
-                    if run_style_check(file_path, args.rules, style_output):
-                        with open(style_output, "r") as f:
-                            style_suggestions = json.load(f)
-                            all_style_suggestions.extend(style_suggestions)
-                    
-                    # Run grammar check
-                    grammar_output = f"{file_path}.grammar.json"
-                    if run_grammar_check(file_path, grammar_output):
-                        with open(grammar_output, "r") as f:
-                            grammar_suggestions = json.load(f)
-                            all_grammar_suggestions.extend(grammar_suggestions)
-                    
-                    # Clean up temporary files
-                    if os.path.exists(style_output):
-                        os.remove(style_output)
-                    if os.path.exists(grammar_output):
-                        os.remove(grammar_output)
-        
-        # Save all suggestions
-        style_output = "all_style_suggestions.json"
-        with open(style_output, "w") as f:
-            json.dump(all_style_suggestions, f, indent=2)
-        
-        grammar_output = "all_grammar_suggestions.json"
-        with open(grammar_output, "w") as f:
-            json.dump(all_grammar_suggestions, f, indent=2)
-        
-        # Combine results
-        combined_count = combine_suggestions(style_output, grammar_output, args.output)
-        
-        style_count = len(all_style_suggestions)
-        grammar_count = len(all_grammar_suggestions)
-        
-        # Clean up temporary files
-        if os.path.exists(style_output):
-            os.remove(style_output)
-        if os.path.exists(grammar_output):
-            os.remove(grammar_output)
+        for file_path in iter_markdown_files(args.dir):
+            try:
+                style_suggestions, grammar_suggestions = check_file(file_path, style_rules)
+            except (UnicodeDecodeError, OSError) as e:
+                print(f"Error checking {file_path}: {e}")
+                continue
+            all_style_suggestions.extend(style_suggestions)
+            all_grammar_suggestions.extend(grammar_suggestions)
+    
+    # Combine results
+    combined_count = combine_suggestions(all_style_suggestions, all_grammar_suggestions, args.output)
+    
+    style_count = len(all_style_suggestions)
+    grammar_count = len(all_grammar_suggestions)
     
     # Print summary
     print_summary(style_count, grammar_count, combined_count)
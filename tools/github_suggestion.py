@@ -9,42 +9,54 @@ import argparse
 import json
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 
-def format_github_suggestions(suggestions):
-    """Format suggestions as GitHub review comments."""
-    github_comments = []
-    
-    # Group suggestions by file
-    file_suggestions = {}
+def group_suggestions(suggestions):
+    """Group suggestions by file."""
+    file_suggestions = defaultdict(list)
     for sugg in suggestions:
-        file_path = sugg["file"]
-        if file_path not in file_suggestions:
-            file_suggestions[file_path] = []
-        file_suggestions[file_path].append(sugg)
+        file_suggestions[sugg["file"]].append(sugg)
+    return file_suggestions
+
+def format_comment(sugg):
+    """Format a single suggestion as a GitHub review comment body."""
+    return (
+        f"**Style suggestion**: {sugg['reason']}\n\n"
+        f"```suggestion\n{sugg['suggested']}\n```"
+    )
+
+def format_grouped_suggestions(file_suggestions):
+    """Format suggestions, already grouped by file, as GitHub review comments."""
+    github_comments = []
     
-    # Format suggestions for each file
     for file_path, file_suggs in file_suggestions.items():
-        print(f"\nSuggestions for {file_path}:")
-        print("=" * 80)
-        
         for sugg in file_suggs:
-            comment = (
-                f"**Style suggestion**: {sugg['reason']}\n\n"
-                f"```suggestion\n{sugg['suggested']}\n```"
-            )
             github_comments.append({
                 "path": file_path,
                 "line": sugg["line"],
-                "body": comment
+                "body": format_comment(sugg)
             })
-            
-            print(f"Line {sugg['line']}:")
-            print(comment)
-            print("-" * 80)
     
     return github_comments
 
+def format_github_suggestions(suggestions):
+    """Format suggestions as GitHub review comments."""
+    return format_grouped_suggestions(group_suggestions(suggestions))
+
+def print_suggestions(github_comments):
+    """Print GitHub review comments, which are ordered by file."""
+    current_path = None
+    for comment in github_comments:
+        if comment["path"] != current_path:
+            current_path = comment["path"]
+            print(f"\nSuggestions for {current_path}:")
+            print("=" * 80)
+        
+        print(f"Line {comment['line']}:")
+        print(comment["body"])
+        print("-" * 80)
+
 def main():
     parser = argparse.ArgumentParser(description="Format style suggestions as GitHub review comments")
     parser.add_argument("--input", default="style_suggestions.json", help="Input JSON file with style suggestions")
@@ -62,6 +74,7 @@ def main():
         sys.exit(0)
     
     github_comments = format_github_suggestions(suggestions)
+    print_suggestions(github_comments)
     
     print(f"\nFormatted {len(github_comments)} GitHub review comments.")
     print("\nThese comments can be used in the GitHub API to create review comments.")
@@ -5,37 +5,62 @@ This script checks markdown files for grammar issues using the LanguageTool API.
 """
 
 import argparse
+import bisect
 import json
 import os
 import re
 import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import html
-import markdown
-from bs4 import BeautifulSoup
 
-def is_in_code_block(lines, line_index):
-    """Check if the line is within a code block."""
-    code_block_count = 0
-    for i in range(line_index):
-        if re.match(r'^```', lines[i]):
-            code_block_count += 1
-    
-    return code_block_count % 2 == 1  # Odd count means inside a code block
+# Code block fences, and lines that are never prose (headings, list items, link references)
+_FENCE = re.compile(r'^\s*```')
+_SKIP = re.compile(r'^(#+\s|[*-]\s|\s*\[.*\]:\s*)')
 
-def is_in_yaml_frontmatter(lines, line_index):
-    """Check if the line is within YAML frontmatter."""
-    if line_index == 0 and lines[0].strip() == '---':
-        return True
-        
-    frontmatter_markers = 0
-    for i in range(line_index):
-        if lines[i].strip() == '---':
-            frontmatter_markers += 1
+# Inline code spans, which are set aside so the patterns below leave their text untouched
+_CODE_SPAN = re.compile(r'`([^`]*)`')
+_CODE_PLACEHOLDER = re.compile(r'\x00(\d+)\x00')
+
+# Inline markdown to strip from prose lines, with the text to keep in its place
+_INLINE_PATTERNS = [
+    (re.compile(r'\{\{[<%].*?[>%]\}\}'), ''),  # Hugo shortcodes
+    (re.compile(r'!?\[([^\]]*)\]\([^)]*\)'), r'\1'),  # Links and images
+    (re.compile(r'<([A-Za-z][A-Za-z0-9+.-]*:[^\s>\x00]+|[^\s>@\x00]+@[^\s>\x00]+)>'), r'\1'),  # Autolinks
+    (re.compile(r'(\*{1,3}|\b_{1,3})(?=\S)([^*_]+?)(?<=\S)\1'), r'\2'),  # Emphasis
+    (re.compile(r'</?[A-Za-z][^>\x00]*>'), ''),  # HTML tags
+]
+
+def strip_inline_markdown(line):
+    """Convert a line of markdown to plain text, keeping the text of code spans as is."""
+    code_spans = []
+    
+    def set_aside(match):
+        code_spans.append(match.group(1))
+        return f"\x00{len(code_spans) - 1}\x00"
     
-    # If we've seen an odd number of markers, we're in frontmatter
-    return frontmatter_markers % 2 == 1
+    text = _CODE_SPAN.sub(set_aside, line)
+    for pattern, replacement in _INLINE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    text = html.unescape(text)
+    
+    return _CODE_PLACEHOLDER.sub(lambda match: code_spans[int(match.group(1))], text)
+
+# Number of concurrent LanguageTool API requests
+MAX_WORKERS = 8
+
+# Shared session for LanguageTool API requests, keeping connections alive and
+# retrying rate limited or failed requests with exponential backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["POST"],
+)))
 
 def extract_text_from_markdown(content):
     """Extract plain text from markdown, preserving line numbers."""
@@ -44,22 +69,24 @@ def extract_text_from_markdown(content):
     line_map = {}  # Maps text line numbers to original markdown line numbers
     
     current_text_line = 0
+    in_code_block = False
+    in_frontmatter = False
     
     for i, line in enumerate(lines):
+        # Track code blocks and YAML frontmatter in a single pass, skipping the markers themselves
+        if _FENCE.match(line):
+            in_code_block = not in_code_block
+            continue
+        if not in_code_block and line.strip() == '---':
+            in_frontmatter = not in_frontmatter
+            continue
+        
         # Skip code blocks, YAML frontmatter, and other non-prose content
-        if (is_in_code_block(lines, i) or 
-            is_in_yaml_frontmatter(lines, i) or 
-            re.match(r'^#+\s', line) or  # Skip headings
-            re.match(r'^[*-]\s', line) or  # Skip list items
-            re.match(r'^\s*```', line) or  # Skip code block markers
-            re.match(r'^\s*\[.*\]:\s*', line) or  # Skip link references
-            not line.strip()):  # Skip empty lines
+        if in_code_block or in_frontmatter or not line.strip() or _SKIP.match(line):
             continue
         
         # Convert markdown to plain text for this line
-        html_content = markdown.markdown(line)
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text_line = soup.get_text()
+        text_line = strip_inline_markdown(line)
         
         if text_line.strip():
             text_lines.append(text_line)
@@ -85,7 +112,7 @@ def check_grammar(content, file_path):
     }
     
     try:
-        response = requests.post(url, data=params)
+        response = _SESSION.post(url, data=params, timeout=(5, 30))
         response.raise_for_status()  # Raise exception for HTTP errors
         result = response.json()
     except requests.exceptions.RequestException as e:
@@ -96,13 +123,16 @@ def check_grammar(content, file_path):
     suggestions = []
     lines = content.split('\n')
     
+    # Offsets of each newline in the plain text, to look up the line of a match
+    newline_offsets = [m.start() for m in re.finditer('\n', text)]
+    
     for match in result.get('matches', []):
         # Get the offset in the plain text
         offset = match.get('offset', 0)
         length = match.get('length', 0)
         
         # Find the line number in the plain text
-        text_line_num = text[:offset].count('\n')
+        text_line_num = bisect.bisect_left(newline_offsets, offset)
         
         # Map back to the original markdown line number
         if text_line_num in line_map:
@@ -173,7 +203,7 @@ def main():
         print("Error: Please provide either --file or --dir argument")
         sys.exit(1)
     
-    all_suggestions = []
+    files_to_check = []
     
     # Check a specific file
     if args.file:
@@ -185,11 +215,7 @@ def main():
             print(f"Warning: {args.file} is not a markdown file. Checking anyway.")
         
         with open(args.file, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        suggestions = check_grammar(content, args.file)
-        all_suggestions.extend(suggestions)
-        print(f"Checked {args.file}: Found {len(suggestions)} grammar issues")
+            files_to_check.append((args.file, f.read()))
     
     # Check all markdown files in a directory
     if args.dir:
@@ -202,11 +228,15 @@ def main():
                 if file.endswith((".md", ".mdx")):
                     file_path = os.path.join(root, file)
                     with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    
-                    suggestions = check_grammar(content, file_path)
-                    all_suggestions.extend(suggestions)
-                    print(f"Checked {file_path}: Found {len(suggestions)} grammar issues")
+                        files_to_check.append((file_path, f.read()))
+    
+    # The API calls are network bound, so run them concurrently
+    all_suggestions = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(lambda item: check_grammar(item[1], item[0]), files_to_check)
+        for (file_path, _), suggestions in zip(files_to_check, results):
+            all_suggestions.extend(suggestions)
+            print(f"Checked {file_path}: Found {len(suggestions)} grammar issues")
     
     # Print and save suggestions
     print_suggestions(all_suggestions)
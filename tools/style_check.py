@@ -45,32 +45,55 @@ def load_style_rules(rules_file):
     """Load style rules from a JSON file."""
     try:
         with open(rules_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+            style_rules = json.load(f)
+        # Compile each pattern once, rather than on every line it is checked against
+        for rule in style_rules:
+            rule["_re"] = re.compile(rule["pattern"], re.IGNORECASE)
+        return style_rules
     except Exception as e:
         print(f"Error loading style rules: {e}")
         return []
 
-def is_in_code_block(lines, line_index):
-    """Check if the line is within a code block."""
-    code_block_count = 0
-    for i in range(line_index):
-        if re.match(r'^```', lines[i]):
-            code_block_count += 1
+_FENCE = re.compile(r'^```')
 
-    return code_block_count % 2 == 1  # Odd count means inside a code block
+def compile_style_rules(style_rules):
+    """
+    Compile style rules for checking.
+    Returns the compiled pattern of each rule, one pattern matching any rule, and the
+    plain text of the rules from extract_rule_literals. Patterns already compiled by
+    load_style_rules are reused.
+    """
+    rule_patterns = [rule.get("_re") or re.compile(rule["pattern"], re.IGNORECASE) for rule in style_rules]
+    patterns = [rule["pattern"] for rule in style_rules]
+    rules_pattern = re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    return rule_patterns, rules_pattern, extract_rule_literals(patterns)
+
+def extract_rule_literals(patterns):
+    """Return the lowercase text of each pattern, or None if any pattern is more than a plain phrase."""
+    literals = []
+    for pattern in patterns:
+        literal = pattern.replace(r"\b", "")
+        if not re.fullmatch(r"[\w ]+", literal):
+            return None
+        literals.append(literal.lower())
+    return tuple(literals)
+
+def find_code_and_frontmatter_lines(lines):
+    """Return a list of flags marking the lines within a code block or YAML frontmatter."""
+    flags = []
+    in_code_block = False
+    in_frontmatter = False
 
-def is_in_yaml_frontmatter(lines, line_index):
-    """Check if the line is within YAML frontmatter."""
-    if line_index == 0 and lines[0].strip() == '---':
-        return True
+    for i, line in enumerate(lines):
+        flags.append(in_code_block or in_frontmatter or (i == 0 and line.strip() == '---'))
 
-    frontmatter_markers = 0
-    for i in range(line_index):
-        if lines[i].strip() == '---':
-            frontmatter_markers += 1
+        # Markers only take effect from the following line
+        if _FENCE.match(line):
+            in_code_block = not in_code_block
+        if line.strip() == '---':
+            in_frontmatter = not in_frontmatter
 
-    # If we've seen an odd number of markers, we're in frontmatter
-    return frontmatter_markers % 2 == 1
+    return flags
 
 def should_capitalize_replacement(original, start_index, replacement):
     """Determine if the replacement should be capitalized based on its position."""
@@ -173,6 +196,8 @@ def check_style(content, file_path, style_rules):
     """Check content against style rules and return suggestions."""
     suggestions = []
     lines = content.split("\n")
+    non_prose = find_code_and_frontmatter_lines(lines)
+    rule_patterns, rules_pattern, rule_literals = compile_style_rules(style_rules)
 
     # First, check for passive voice using spaCy if available
     if SPACY_AVAILABLE:
@@ -182,8 +207,7 @@ def check_style(content, file_path, style_rules):
 
         for i, line in enumerate(lines):
             # Skip code blocks, YAML frontmatter, headings, and links
-            if (is_in_code_block(lines, i) or
-                is_in_yaml_frontmatter(lines, i) or
+            if (non_prose[i] or
                 re.match(r'^#+\s', line) or
                 re.search(r'^\s*\[.*\]:\s*', line)):
                 # End the current paragraph if any
@@ -230,7 +254,7 @@ def check_style(content, file_path, style_rules):
     # Then check each line against style rules
     for i, line in enumerate(lines):
         # Skip code blocks and YAML frontmatter
-        if is_in_code_block(lines, i) or is_in_yaml_frontmatter(lines, i):
+        if non_prose[i]:
             continue
 
         # Skip headings (lines starting with #)
@@ -241,14 +265,23 @@ def check_style(content, file_path, style_rules):
         if re.search(r'^\s*\[.*\]:\s*', line):
             continue
 
+        # Skip lines that none of the style rules match, using a plain substring
+        # check first when every rule is a literal phrase
+        if rule_literals is not None:
+            lowered = line.lower()
+            if not any(literal in lowered for literal in rule_literals):
+                continue
+        if not rules_pattern.search(line):
+            continue
+
         # If we already have a suggestion for this line, skip further checks
         if any(sugg["line"] == i + 1 for sugg in suggestions):
             continue
 
         # Check against other style rules
-        for rule in style_rules:
-            matches = list(re.finditer(rule["pattern"], line, re.IGNORECASE))
-            for match in matches:
+        for rule, rule_pattern in zip(style_rules, rule_patterns):
+            # Iterate lazily, most lines only need the first match
+            for match in rule_pattern.finditer(line):
                 # Create a suggestion
                 original = line
 